@@ -1,29 +1,55 @@
-from typing import List, Dict, Tuple
-import math
+from typing import List, Dict
+import numpy as np
+
+try:
+    from numba import njit  # optional; pure-NumPy fallback below works without it
+except ImportError:
+    njit = None
+
+# Fixed position → small-int mapping for array indexing in the scorer
+_POS_IDX = {"QB": 0, "RB": 1, "WR": 2, "TE": 3, "DEF": 4, "K": 5}
 
 def tier_players(pool: List[Dict]) -> List[List[Dict]]:
     """
     Pool items need: {"player_id","name","pos","proj","adp"}
-    Tiers by z-score within position; break tier when drop > threshold.
+    Tiers by proj within position; break tier when drop > threshold.
+    SoA layout: parallel proj/pos arrays so the per-position sort and
+    break detection run inside NumPy instead of a Python walk.
     """
-    by_pos = {}
-    for p in pool:
-        by_pos.setdefault(p["pos"], []).append(p)
+    if not pool:
+        return []
+    proj = np.fromiter((p["proj"] for p in pool), dtype=np.float64, count=len(pool))
+    positions, pos_idx = np.unique([p["pos"] for p in pool], return_inverse=True)
     tiers = []
-    for pos, players in by_pos.items():
-        players.sort(key=lambda x: x["proj"], reverse=True)
-        prev = None
-        current_tier = []
-        for p in players:
-            if prev and (prev["proj"] - p["proj"]) > 1.8:  # crude tier break
-                tiers.append(current_tier)
-                current_tier = []
-            current_tier.append(p)
-            prev = p
-        if current_tier: tiers.append(current_tier)
-    # Flatten while keeping tier boundaries (already chunked)
+    for g in range(len(positions)):
+        group = np.flatnonzero(pos_idx == g)
+        order = group[np.argsort(-proj[group])]
+        sp = proj[order]
+        breaks = np.flatnonzero(sp[:-1] - sp[1:] > 1.8) + 1  # crude tier break
+        for tier_idx in np.split(order, breaks):
+            if tier_idx.size:
+                # materialize dicts only at the boundary the CLI consumes
+                tiers.append([pool[i] for i in tier_idx])
     return tiers
 
+def _score_all(proj, pos_idx, pick_num, adp, need_bonus, rem_quality):
+    """Scoring kernel over SoA arrays; JIT-compiled when numba is installed."""
+    n = proj.shape[0]
+    scores = np.empty(n, dtype=np.float64)
+    for i in range(n):
+        rq = rem_quality[pos_idx[i]]
+        if rq < 1:
+            rq = 1
+        scarcity = 2.0 / rq
+        reach = pick_num[i] - adp[i]
+        if reach < 0.0:
+            reach = 0.0
+        scores[i] = proj[i] + scarcity + need_bonus[pos_idx[i]] - 0.02 * reach
+    return scores
+
+if njit is not None:
+    _score_all = njit(cache=True)(_score_all)
+
 def suggest_pick(available: List[Dict], my_roster_needs: Dict[str,int], picks_until_next:int) -> List[Dict]:
     """
     Score = proj + scarcity + need - reach_penalty
@@ -31,18 +57,28 @@ def suggest_pick(available: List[Dict], my_roster_needs: Dict[str,int], picks_un
     need: if you still need a starter at a pos → bonus
     reach_penalty: don’t reach too far past ADP unless scarcity is high
     """
-    # Count remaining quality per position
-    quality_cut = 10.0
-    remaining_quality = {}
-    for p in available:
-        remaining_quality[p["pos"]] = remaining_quality.get(p["pos"],0) + (1 if p["proj"] >= quality_cut else 0)
-
-    def score(p):
-        scarcity = 2.0 * (1.0 / max(1, remaining_quality.get(p["pos"],1)))
-        need_bonus = 2.5 if my_roster_needs.get(p["pos"],0) > 0 else 0.5
-        reach = max(0, p.get("pick_num", 0) - p.get("adp_pick", 0))
-        reach_pen = 0.02 * reach
-        return p["proj"] + scarcity + need_bonus - reach_pen
-
-    ranked = sorted(available, key=score, reverse=True)
-    return ranked[:5]
+    if not available:
+        return []
+    n = len(available)
+    n_pos = len(_POS_IDX) + 1  # last slot catches unknown positions
+
+    # Extract columns once; scoring runs over arrays, not dicts
+    proj = np.fromiter((p["proj"] for p in available), dtype=np.float64, count=n)
+    pos_idx = np.fromiter((_POS_IDX.get(p["pos"], n_pos - 1) for p in available), dtype=np.int64, count=n)
+    pick_num = np.fromiter((p.get("pick_num", 0) for p in available), dtype=np.float64, count=n)
+    adp = np.fromiter((p.get("adp_pick", 0) for p in available), dtype=np.float64, count=n)
+
+    # Remaining quality per position (proj >= 10.0 counts as a quality option)
+    rem_quality = np.bincount(pos_idx[proj >= 10.0], minlength=n_pos)
+    need_bonus = np.array(
+        [2.5 if my_roster_needs.get(pos, 0) > 0 else 0.5 for pos in _POS_IDX] + [0.5],
+        dtype=np.float64,
+    )
+
+    scores = _score_all(proj, pos_idx, pick_num, adp, need_bonus, rem_quality)
+    if n > 5:
+        top = np.argpartition(-scores, 5)[:5]
+        top = top[np.argsort(-scores[top])]
+    else:
+        top = np.argsort(-scores)
+    return [available[i] for i in top]
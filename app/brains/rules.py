@@ -1,33 +1,102 @@
 from typing import List, Dict
+from heapq import nlargest
+from operator import itemgetter
+import numpy as np
 
-def suggest_lineup(features: List[Dict], slots: Dict[str, int]) -> List[Dict]:
+from app.features import INJURY_CODES
+
+# Penalty per injury status; one dict probe beats chained string compares
+# on every sort comparison. Unknown/OK statuses fall through to 0.0.
+_INJURY_PEN = {"O": 4.0, "IR": 4.0, "Q": 2.0, "D": 2.0}
+
+# Same penalties as an array indexed by features.INJURY_CODES, for the
+# vectorized SoA path. float32 to match the narrow feature columns.
+_INJURY_PEN_TABLE = np.zeros(len(INJURY_CODES), dtype=np.float32)
+for _status, _code in INJURY_CODES.items():
+    _INJURY_PEN_TABLE[_code] = _INJURY_PEN.get(_status, 0.0)
+
+# Positions allowed to fill a FLEX slot
+_FLEX_ELIGIBLE = ("RB", "WR", "TE")
+
+def _make_fill_fn(slots: Dict[str, int]):
+    """
+    Partial-evaluate the slot-fill loop for a concrete slot shape.
+
+    The generic loop pays two dict lookups and a dict write per candidate;
+    roster shapes are fixed per league, so we template a function with one
+    local int counter per slot and an if/elif chain, and exec it once.
+    """
+    counters = {pos: f"n{i}" for i, pos in enumerate(slots)}
+    lines = [
+        "def _fill(decorated):",
+        "    lineup = []",
+    ]
+    for var in counters.values():
+        lines.append(f"    {var} = 0")
+    lines.append("    for s, f in decorated:")
+    lines.append('        pos = f["pos"]')
+    kw = "if"
+    for pos, cap in slots.items():
+        if pos == "FLEX":
+            continue
+        var = counters[pos]
+        lines.append(f'        {kw} pos == "{pos}" and {var} < {int(cap)}:')
+        lines.append(f'            lineup.append({{"player_id": f["player_id"], "slot": "{pos}", "score": round(s, 2)}})')
+        lines.append(f"            {var} += 1")
+        kw = "elif"
+    if "FLEX" in slots:
+        var = counters["FLEX"]
+        lines.append(f'        {kw} {var} < {int(slots["FLEX"])} and pos in {_FLEX_ELIGIBLE!r}:')
+        lines.append('            lineup.append({"player_id": f["player_id"], "slot": "FLEX", "score": round(s, 2)})')
+        lines.append(f"            {var} += 1")
+    lines.append("    return lineup")
+    ns = {}
+    exec("\n".join(lines), ns)
+    return ns["_fill"]
+
+_FILL_CACHE: Dict[frozenset, object] = {}
+
+def _fill_fn(slots: Dict[str, int]):
+    key = frozenset(slots.items())
+    fn = _FILL_CACHE.get(key)
+    if fn is None:
+        fn = _FILL_CACHE.setdefault(key, _make_fill_fn(slots))
+    return fn
+
+def suggest_lineup(features, slots: Dict[str, int]) -> List[Dict]:
     """
     Simple heuristic:
     - Sort by (proj - penalty) where penalty factors in injury + tough defense.
     - Fill required slots first (e.g., RB2/WR2/QB/TE), then FLEX.
+
+    Accepts either a list of per-player dicts (build_lineup_features) or
+    the SoA dict-of-arrays shape (build_lineup_features_soa); the latter
+    scores the whole roster in one vectorized expression.
     """
+    if isinstance(features, dict):
+        # SoA path: table-lookup penalties + one argsort in C
+        inj_pen = np.take(_INJURY_PEN_TABLE, features["injury_code"])
+        # np.float32 scalar keeps the arithmetic in single precision
+        scores = features["proj"] + (features["def_rank"] - 16) * np.float32(0.1) - inj_pen
+        order = np.argsort(-scores)
+        pids = features["player_id"]
+        poss = features["pos"]
+        decorated = [(float(scores[i]), {"player_id": pids[i], "pos": poss[i]}) for i in order]
+        return _fill_fn(slots)(decorated)
+
     def score(f):
-        injury_pen = 4.0 if f["injury"] in ("O","IR") else 2.0 if f["injury"] in ("Q","D") else 0.0
+        injury_pen = _INJURY_PEN.get(f["injury"], 0.0)
         def_pen = (f["def_rank"] - 16) * 0.1  # positive if easier than avg
         return f["proj"] + def_pen - injury_pen
 
-    ranked = sorted(features, key=score, reverse=True)
-    lineup = []
-    filled = {k: 0 for k in slots}
-    for f in ranked:
-        pos = f["pos"]
-        # place in a matching slot or FLEX
-        placed = False
-        if pos in filled and filled[pos] < slots[pos]:
-            lineup.append({"player_id": f["player_id"], "slot": pos, "score": round(score(f),2)})
-            filled[pos] += 1
-            placed = True
-        if not placed and "FLEX" in filled and filled["FLEX"] < slots["FLEX"] and pos in ("RB","WR","TE"):
-            lineup.append({"player_id": f["player_id"], "slot": "FLEX", "score": round(score(f),2)})
-            filled["FLEX"] += 1
-    return lineup
+    # Score once per player, then sort the (score, feature) pairs —
+    # avoids re-running score() for every comparison and output row.
+    decorated = [(score(f), f) for f in features]
+    decorated.sort(key=itemgetter(0), reverse=True)
+    # Slot fill runs through a function specialized (and cached) per shape
+    return _fill_fn(slots)(decorated)
 
 def suggest_waivers(free_agents_feats, roster_weak_positions=("RB","WR")):
-    # Find undervalued FAs vs your worst bench at weak positions
-    ranked_fa = sorted(free_agents_feats, key=lambda f: f["proj"], reverse=True)
-    return ranked_fa[:5]
+    # Find undervalued FAs vs your worst bench at weak positions.
+    # Top-5 via a bounded heap (O(N log 5)) instead of a full sort.
+    return nlargest(5, free_agents_feats, key=itemgetter("proj"))
@@ -3,13 +3,20 @@ import sys
 import typer
 from rich.prompt import Prompt
 from typing import Optional
+import argparse
+import json
 import shlex
+from functools import lru_cache
 from app.config import load_settings
-from app.yahoo_client import YahooClient
-from app.repo import Repo
-from app.scheduler import start_scheduler
-from app.brains.rules import suggest_lineup, suggest_waivers
-from app.brains.draft import suggest_pick
+
+try:
+    import orjson  # ~2-10x faster than stdlib json for row streaming
+except ImportError:
+    orjson = None
+
+# Heavy dependencies (SQLAlchemy, APScheduler, yahoo_oauth, numpy) are
+# imported inside the commands that need them so --help and completion
+# don't pay their import cost.
 from app.ui import (
     banner, print_info, print_success, print_warn, print_error,
     yahoo_error_to_str, kv_table, simple_table, console
@@ -18,6 +25,16 @@ from app.ui import (
 app = typer.Typer(help="Fantasy AI CLI")
 
 
+@lru_cache(maxsize=1)
+def _client():
+    """One YahooClient per process — OAuth token load and session setup
+    happen once even when several subcommands run back to back."""
+    from app.yahoo_client import YahooClient
+
+    cfg = load_settings()
+    return YahooClient(cfg.league_id)
+
+
 def _print_commands():
     console.print(
         "Commands: "
@@ -41,107 +58,224 @@ def _available_usage():
         "  available --pos RB --limit 30\n"
         "  available --search smith --sort POWN\n"
     )
+# Built once at module scope; argparse resolves known options via dict
+# lookup instead of the old per-token elif chain (and handles --pos=RB
+# and -p RB forms for free).
+_AVAIL_PARSER = argparse.ArgumentParser(prog="available", add_help=False, exit_on_error=False)
+_AVAIL_PARSER.add_argument("--pos", "-p")
+_AVAIL_PARSER.add_argument("--search")
+_AVAIL_PARSER.add_argument("--sort", default="AR")
+_AVAIL_PARSER.add_argument("--limit", type=int)
+_AVAIL_PARSER.add_argument("--no-waivers", dest="include_waivers", action="store_false")
+_AVAIL_PARSER.add_argument("--jsonl", action="store_true")
+_AVAIL_PARSER.add_argument("positional", nargs="*")
+
+
+_AVAILABLE_COLS = ["Player", "Pos", "Elig", "Team", "Bye", "%Own", "Stat", "Inj", "Avail", "ID"]
+
+
+def _build_rows(players):
+    """Normalize available_players() output into display rows (shared by
+    the Typer command and the REPL handler)."""
+    rows = []
+    for p in players:
+        rows.append({
+            "Player": p["name"],
+            "Pos": p["pos"],
+            "Elig": ",".join(p["elig"] or []),
+            "Team": p["team"],
+            "Bye": p["bye"],
+            "%Own": p["%owned"],
+            "Stat": p["stat"],   # Q/O/IR, etc.
+            "Inj": (p["inj"] or "")[:20] if p.get("inj") else "",
+            "Avail": p.get("avail", "FA"),
+            "ID": p["player_id"],
+        })
+    return rows
+
+
+def _emit_jsonl(rows):
+    """Write newline-delimited JSON straight to stdout, bypassing Rich."""
+    out = sys.stdout.buffer
+    if orjson is not None:
+        for r in rows:
+            out.write(orjson.dumps(r))
+            out.write(b"\n")
+    else:
+        for r in rows:
+            sys.stdout.write(json.dumps(r, separators=(",", ":")) + "\n")
+    sys.stdout.flush()
+
+
 def _handle_available(y, argv: str):
     """
     Parse and execute: available [--pos POS] [--search TEXT] [--sort AR|POWN|NAME] [--limit N] [--no-waivers] [--jsonl]
     """
     # Tokenize the rest of the line after 'available'
     tokens = shlex.split(argv)
-    pos = None
-    search = None
-    sort = "AR"
-    limit = None
-    include_waivers = True
-    jsonl = False
-
-    i = 0
-    while i < len(tokens):
-        t = tokens[i]
-        # flags with value
-        if t in ("--pos", "-p"):
-            i += 1; pos = tokens[i] if i < len(tokens) else None
-        elif t.startswith("--pos="):
-            pos = t.split("=", 1)[1]
-        elif t == "--search":
-            i += 1; search = tokens[i] if i < len(tokens) else None
-        elif t.startswith("--search="):
-            search = t.split("=", 1)[1]
-        elif t == "--sort":
-            i += 1; sort = (tokens[i] if i < len(tokens) else sort).upper()
-        elif t.startswith("--sort="):
-            sort = t.split("=", 1)[1].upper()
-        elif t == "--limit":
-            i += 1
-            try:
-                limit = int(tokens[i]) if i < len(tokens) else None
-            except Exception:
-                limit = None
-        # boolean flags
-        elif t == "--no-waivers":
-            include_waivers = False
-        elif t == "--jsonl":
-            jsonl = True
-        # help
-        elif t in ("-h", "--help"):
-            _available_usage()
-            return
+    if any(t in ("-h", "--help") for t in tokens):
+        _available_usage()
+        return
+    try:
+        args, extras = _AVAIL_PARSER.parse_known_args(tokens)
+    except (argparse.ArgumentError, SystemExit):
+        _available_usage()
+        return
+
+    pos = args.pos
+    search = args.search
+    sort = (args.sort or "AR").upper()
+    limit = args.limit
+    include_waivers = args.include_waivers
+    jsonl = args.jsonl
+
+    # allow shorthand like: available RB
+    for t in list(args.positional) + extras:
+        if pos is None and t.upper() in ("QB","RB","WR","TE","DEF","K"):
+            pos = t.upper()
         else:
-            # allow shorthand like: available RB
-            if pos is None and t.upper() in ("QB","RB","WR","TE","DEF","K"):
-                pos = t.upper()
-            else:
-                console.print(f"[yellow]Warning:[/yellow] ignoring unknown option '{t}'")
-        i += 1
+            console.print(f"[yellow]Warning:[/yellow] ignoring unknown option '{t}'")
 
     try:
-        rows = []
-        for p in y.available_players(
+        players = y.available_players(
             position=pos,
             include_waivers=include_waivers,
             search=search,
             sort=sort,
             limit=limit,
-        ):
-            rows.append({
-                "Player": p["name"],
-                "Pos": p["pos"],
-                "Elig": ",".join(p["elig"] or []),
-                "Team": p["team"],
-                "Bye": p["bye"],
-                "%Own": p["%owned"],
-                "Stat": p["stat"],
-                "Inj": (p["inj"] or "")[:20] if p.get("inj") else "",
-                "Avail": p.get("avail", "FA"),
-                "ID": p["player_id"],
-            })
+        )
 
         if jsonl:
-            for r in rows:
-                console.print_json(data=r)
+            # Stream the normalized rows as-is; no display rekeying, no Rich
+            _emit_jsonl(players)
+            return
+
+        rows = _build_rows(players)
+        if not rows:
+            print_warn("No available players found with the given filters.")
         else:
-            if not rows:
-                print_warn("No available players found with the given filters.")
-            else:
-                cols = ["Player", "Pos", "Elig", "Team", "Bye", "%Own", "Stat", "Inj", "Avail", "ID"]
-                console.print(simple_table("Available Players", cols, rows))
-                print_success(
-                    f"Shown: {len(rows)} "
-                    f"(pos={pos or 'ANY'}, sort={sort}, waivers={'on' if include_waivers else 'off'})"
-                )
+            console.print(simple_table("Available Players", _AVAILABLE_COLS, rows))
+            print_success(
+                f"Shown: {len(rows)} "
+                f"(pos={pos or 'ANY'}, sort={sort}, waivers={'on' if include_waivers else 'off'})"
+            )
     except Exception as e:
         print_error(f"Available error:\n{yahoo_error_to_str(e)}")
 
 
+# --- REPL command handlers ---------------------------------------------------
+# Each takes (y, cfg, rest) so the dispatch table below can call them
+# uniformly; rest is the raw text after the command keyword.
+
+def _cmd_help(y, cfg, rest):
+    _print_commands()
+
+
+def _cmd_available(y, cfg, rest):
+    _handle_available(y, rest)
+
+
+def _cmd_ping(y, cfg, rest):
+    # Health check with friendly output
+    try:
+        teams = y.teams()
+        settings = y.settings()
+        rows = {
+            "League": cfg.league_id,
+            "Teams": len(teams),
+            "Scoring": settings.get("scoring_type", "?"),
+        }
+        console.print(kv_table("Yahoo Health", rows))
+        print_success("Yahoo API reachable.")
+    except Exception as e:
+        print_error(yahoo_error_to_str(e))
+
+
+def _cmd_lineup(y, cfg, rest):
+    from app.brains.rules import suggest_lineup
+
+    # TODO: build real features from repo+yahoo
+    features = []  # placeholder
+    slots = {"QB": 1, "RB": 2, "WR": 2, "TE": 1, "FLEX": 1}
+    try:
+        sug = suggest_lineup(features, slots)
+        if not sug:
+            print_warn("No lineup suggestions yet (features empty).")
+        else:
+            cols = ["player_id", "slot", "score"]
+            console.print(simple_table("Lineup Suggestions", cols, sug))
+    except Exception as e:
+        print_error(f"Lineup error:\n{yahoo_error_to_str(e)}")
+
+
+def _cmd_waivers(y, cfg, rest):
+    from app.brains.rules import suggest_waivers
+
+    # TODO: pull free agents and build features
+    fa_feats = []  # placeholder
+    try:
+        sug = suggest_waivers(fa_feats)
+        if not sug:
+            print_warn("No waiver suggestions yet (features empty).")
+        else:
+            cols = list(sug[0].keys())
+            console.print(simple_table("Top Waiver Targets", cols, sug))
+    except Exception as e:
+        print_error(f"Waivers error:\n{yahoo_error_to_str(e)}")
+
+
+def _cmd_draft(y, cfg, rest):
+    from app.brains.draft import suggest_pick
+
+    # TODO: detect live draft + available pool + needs
+    available, needs, picks_until_next = [], {}, 0
+    try:
+        top = suggest_pick(available, needs, picks_until_next)
+        if not top:
+            print_warn("No draft suggestions yet (empty pool).")
+        else:
+            cols = list(top[0].keys())
+            console.print(simple_table("Draft Picks (Top 5)", cols, top))
+    except Exception as e:
+        print_error(f"Draft error:\n{yahoo_error_to_str(e)}")
+
+
+def _cmd_unknown(y, cfg, low):
+    # Basic intent hints for natural-language input
+    if "who should i start" in low:
+        console.print("Try [bold]lineup[/] to see ranked starters and FLEX.")
+    elif "who do i draft" in low or "on the clock" in low:
+        console.print("Try [bold]draft[/] to see on-the-clock suggestions.")
+    else:
+        _print_commands()
+
+
+_REPL_COMMANDS = {
+    "help": _cmd_help,
+    "?": _cmd_help,
+    "available": _cmd_available,
+    "ping": _cmd_ping,
+    "health": _cmd_ping,
+    "check": _cmd_ping,
+    "lineup": _cmd_lineup,
+    "waivers": _cmd_waivers,
+    "draft": _cmd_draft,
+}
+
+
 @app.command("run")
 def run_command():
     """
     Start the Fantasy AI interactive coach with the hourly Yahoo poller.
     """
+    from app.repo import Repo
+    from app.scheduler import start_scheduler
+
     cfg = load_settings()
 
     # Boot Yahoo + DB + scheduler
     try:
-        y = YahooClient(cfg.league_id)
+        y = _client()
     except Exception as e:
         print_error(f"Failed to initialize Yahoo client:\n{yahoo_error_to_str(e)}")
         raise typer.Exit(code=1)
@@ -162,7 +296,7 @@ def run_command():
     console.print("Type natural language or a command.")
     _print_commands()
 
-    # Simple REPL
+    # Simple REPL: O(1) dispatch on the first token
     while True:
         try:
             q = Prompt.ask("[bold cyan]›[/]").strip()
@@ -173,87 +307,18 @@ def run_command():
         if not q:
             continue
 
-        low = q.lower()
+        cmd, _, rest = q.partition(" ")
+        cmd = cmd.lower()
 
-        if low in ("quit", "exit", "q"):
+        if cmd in ("quit", "exit", "q"):
             console.print("[dim]Exiting…[/]")
             break
 
-        if low in ("help", "?"):
-            _print_commands()
-            continue
-        if low.startswith("available"):
-            # pass the raw text (minus the command keyword) to the handler
-            after = q[len("available"):].strip()
-            _handle_available(y, after)
-            continue
-
-        if low in ("ping", "health", "check"):
-            # Health check with friendly output
-            try:
-                teams = y.teams()
-                settings = y.settings()
-                rows = {
-                    "League": cfg.league_id,
-                    "Teams": len(teams),
-                    "Scoring": settings.get("scoring_type", "?"),
-                }
-                console.print(kv_table("Yahoo Health", rows))
-                print_success("Yahoo API reachable.")
-            except Exception as e:
-                print_error(yahoo_error_to_str(e))
-            continue
-
-        if low.startswith("lineup"):
-            # TODO: build real features from repo+yahoo
-            features = []  # placeholder
-            slots = {"QB": 1, "RB": 2, "WR": 2, "TE": 1, "FLEX": 1}
-            try:
-                sug = suggest_lineup(features, slots)
-                if not sug:
-                    print_warn("No lineup suggestions yet (features empty).")
-                else:
-                    cols = ["player_id", "slot", "score"]
-                    console.print(simple_table("Lineup Suggestions", cols, sug))
-            except Exception as e:
-                print_error(f"Lineup error:\n{yahoo_error_to_str(e)}")
-            continue
-
-        if low.startswith("waivers"):
-            # TODO: pull free agents and build features
-            fa_feats = []  # placeholder
-            try:
-                sug = suggest_waivers(fa_feats)
-                if not sug:
-                    print_warn("No waiver suggestions yet (features empty).")
-                else:
-                    cols = list(sug[0].keys())
-                    console.print(simple_table("Top Waiver Targets", cols, sug))
-            except Exception as e:
-                print_error(f"Waivers error:\n{yahoo_error_to_str(e)}")
-            continue
-
-        if low.startswith("draft"):
-            # TODO: detect live draft + available pool + needs
-            available, needs, picks_until_next = [], {}, 0
-            try:
-                top = suggest_pick(available, needs, picks_until_next)
-                if not top:
-                    print_warn("No draft suggestions yet (empty pool).")
-                else:
-                    cols = list(top[0].keys())
-                    console.print(simple_table("Draft Picks (Top 5)", cols, top))
-            except Exception as e:
-                print_error(f"Draft error:\n{yahoo_error_to_str(e)}")
-            continue
-
-        # Basic intent hints
-        if "who should i start" in low:
-            console.print("Try [bold]lineup[/] to see ranked starters and FLEX.")
-        elif "who do i draft" in low or "on the clock" in low:
-            console.print("Try [bold]draft[/] to see on-the-clock suggestions.")
+        handler = _REPL_COMMANDS.get(cmd)
+        if handler:
+            handler(y, cfg, rest.strip())
         else:
-            _print_commands()
+            _cmd_unknown(y, cfg, q.lower())
 
 
 @app.command("ping")
@@ -263,7 +328,7 @@ def ping():
     """
     cfg = load_settings()
     try:
-        y = YahooClient(cfg.league_id)
+        y = _client()
         teams = y.teams()
         settings = y.settings()
         rows = {
@@ -281,54 +346,40 @@ def ping():
 def available_command(
     pos: Optional[str] = typer.Option(None, "--pos", help="Filter by position (QB,RB,WR,TE,DEF,K)"),
     search: Optional[str] = typer.Option(None, "--search", help="Substring on player name"),
-    sort: str = typer.Option("AR", "--sort", help="Yahoo sort: AR, OR, PTS, etc.", show_default=True),
-    page_size: int = typer.Option(25, "--page-size", min=1, max=25, show_default=True),
-    pages: int = typer.Option(2, "--pages", min=1, show_default=True),
+    sort: str = typer.Option("AR", "--sort", help="Sort: AR, POWN, NAME", show_default=True),
+    limit: Optional[int] = typer.Option(None, "--limit", min=1, help="Max rows to show"),
+    no_waivers: bool = typer.Option(False, "--no-waivers", help="Exclude players on waivers"),
     jsonl: bool = typer.Option(False, "--jsonl", help="Emit newline-delimited JSON instead of a table"),
 ):
     """
     List available players (Free Agents + Waivers) for the current league.
     """
-    cfg = load_settings()
     try:
-        y = YahooClient(cfg.league_id)
+        y = _client()
     except Exception as e:
         print_error(f"Yahoo init failed:\n{yahoo_error_to_str(e)}")
         raise typer.Exit(code=1)
 
     try:
-        rows = []
-        for p in y.available_players(
-            status=("FA", "W"),
+        players = y.available_players(
             position=pos,
+            include_waivers=not no_waivers,
             search=search,
             sort=sort,
-            count=page_size,
-            max_pages=pages,
-            include_stats=False,
-        ):
-            rows.append({
-                "Player": p["name"],
-                "Pos": p["pos"],
-                "Elig": ",".join(p["elig"] or []),
-                "Team": p["team"],
-                "Bye": p["bye"],
-                "%Own": p["%owned"],
-                "Stat": p["stat"],   # Q/O/IR, etc.
-                "Inj": (p["inj"] or "")[:20] if p.get("inj") else "",
-                "ID": p["player_id"],
-            })
+            limit=limit,
+        )
 
         if jsonl:
-            for r in rows:
-                console.print_json(data=r)  # pretty JSON lines
+            # Stream the normalized rows as-is; no display rekeying, no Rich
+            _emit_jsonl(players)
+            return
+
+        rows = _build_rows(players)
+        if not rows:
+            print_warn("No available players found with the given filters.")
         else:
-            if not rows:
-                print_warn("No available players found with the given filters.")
-            else:
-                cols = ["Player", "Pos", "Elig", "Team", "Bye", "%Own", "Stat", "Inj", "ID"]
-                console.print(simple_table("Available Players", cols, rows))
-                print_success(f"Shown: {len(rows)} (pos={pos or 'ANY'}, sort={sort})")
+            console.print(simple_table("Available Players", _AVAILABLE_COLS, rows))
+            print_success(f"Shown: {len(rows)} (pos={pos or 'ANY'}, sort={sort})")
 
     except Exception as e:
         print_error(f"Fetch error:\n{yahoo_error_to_str(e)}")
@@ -1,15 +1,19 @@
 import os
 from dataclasses import dataclass
+from functools import lru_cache
 from dotenv import load_dotenv
-load_dotenv()
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class Settings:
     league_id: str
     db_path: str
     poll_interval_min: int
 
+@lru_cache(maxsize=1)
 def load_settings():
+    # .env is read on first use, not at import — keeps --help and
+    # completion paths free of the file I/O.
+    load_dotenv()
     return Settings(
         league_id=os.getenv("YAHOO_LEAGUE_ID",""),
         db_path=os.getenv("DB_PATH","./data/cache.sqlite"),
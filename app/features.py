@@ -1,3 +1,9 @@
+import numpy as np
+
+# Injury status → small int code; rules.py turns these into penalties
+# via a table lookup instead of string compares.
+INJURY_CODES = {"OK": 0, "Q": 1, "D": 2, "O": 3, "IR": 4}
+
 def build_lineup_features(roster, opponent_defense, injuries, weather=None):
     # Return a dict per player with rankable features for the brain
     feats = []
@@ -12,3 +18,19 @@ def build_lineup_features(roster, opponent_defense, injuries, weather=None):
             "risk": p.get("volatility", 0.0),
         })
     return feats
+
+def build_lineup_features_soa(roster, opponent_defense, injuries, weather=None):
+    # SoA variant: one NumPy array per column instead of a dict per
+    # player, so the brain can score the whole roster in one expression.
+    # Narrow dtypes (float32 / int8) — these features need ~0.1 precision
+    # at most, and half-width columns double scoring throughput.
+    n = len(roster)
+    return {
+        "player_id": np.array([p["player_id"] for p in roster], dtype=object),
+        "pos": np.array([p["position"] for p in roster], dtype=object),
+        "proj": np.fromiter((p.get("proj_points", 0.0) for p in roster), dtype=np.float32, count=n),
+        "def_rank": np.fromiter((opponent_defense.get(p["position"], 16) for p in roster), dtype=np.int8, count=n),
+        "injury_code": np.fromiter((INJURY_CODES.get(p.get("status", "OK"), 0) for p in roster), dtype=np.int8, count=n),
+        "snap_trend": np.fromiter((p.get("snap_trend", 0.0) for p in roster), dtype=np.float32, count=n),
+        "risk": np.fromiter((p.get("volatility", 0.0) for p in roster), dtype=np.float32, count=n),
+    }
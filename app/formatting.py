@@ -1,11 +1,23 @@
+import functools
 import shutil
+import signal
 
+@functools.lru_cache(maxsize=1)
 def _term_width(default=100):
+    # Width rarely changes; cache so each table render isn't an ioctl.
     try:
         return shutil.get_terminal_size().columns
     except Exception:
         return default
 
+# Invalidate the cached width when the terminal is resized (POSIX only)
+if hasattr(signal, "SIGWINCH"):
+    try:
+        signal.signal(signal.SIGWINCH, lambda *_: _term_width.cache_clear())
+    except (ValueError, OSError):
+        # e.g. not on the main thread; fall back to the cached value
+        pass
+
 def _crop(s, width):
     if s is None:
         return ""
@@ -19,28 +31,55 @@ def print_table(rows, columns, max_width=120):
 
     term_w = min(_term_width(), max_width)
 
-    # Allocate naive widths
-    col_widths = {c: max(len(c), 4) for c in columns}
-    for r in rows[:200]:
-        for c in columns:
-            col_widths[c] = min(max(col_widths[c], len(str(r.get(c, "")))), max_width // 2)
-
-    # Normalize to terminal width (simple greedy shrink)
-    total = sum(col_widths.values()) + 3 * (len(columns) - 1)
-    while total > term_w:
-        # shrink the widest column > 8
-        widest = max(columns, key=lambda c: col_widths[c])
-        if col_widths[widest] <= 8:
-            break
-        col_widths[widest] -= 1
-        total = sum(col_widths.values()) + 3 * (len(columns) - 1)
+    # Allocate naive widths: transpose the sample once per column so the
+    # length scan is max(map(len, ...)) on a flat list, not a nested loop.
+    sample = rows[:200]
+    # None renders blank (as _crop did before cells were pre-stringified)
+    per_col = {
+        c: ["" if (v := r.get(c)) is None else str(v) for r in sample]
+        for c in columns
+    }
+    cap = max_width // 2
+    col_widths = {
+        c: min(max(len(c), 4, max(map(len, per_col[c]), default=0)), cap)
+        for c in columns
+    }
+
+    # Normalize to terminal width: shrink columns proportionally in one
+    # pass instead of trimming the widest one char at a time.
+    padding = 3 * (len(columns) - 1)
+    overflow = sum(col_widths.values()) + padding - term_w
+    if overflow > 0:
+        # Each column can give up its width above the 8-char floor
+        shrinkable = {c: col_widths[c] - 8 for c in columns if col_widths[c] > 8}
+        tot_shrink = sum(shrinkable.values())
+        if tot_shrink > 0:
+            take = min(overflow, tot_shrink)
+            for c, room in shrinkable.items():
+                col_widths[c] -= min(round(take * room / tot_shrink), room)
+            # one fix-up pass for rounding drift
+            drift = sum(col_widths.values()) + padding - term_w
+            for c in sorted(shrinkable, key=col_widths.get, reverse=True):
+                if drift <= 0:
+                    break
+                give = min(drift, col_widths[c] - 8)
+                if give > 0:
+                    col_widths[c] -= give
+                    drift -= give
 
     # Header
     header = " | ".join(_crop(c, col_widths[c]).ljust(col_widths[c]) for c in columns)
     sep = "-+-".join("-" * col_widths[c] for c in columns)
     print(header)
     print(sep)
-    # Rows
-    for r in rows:
-        line = " | ".join(_crop(r.get(c, ""), col_widths[c]).ljust(col_widths[c]) for c in columns)
+    # Rows — reuse the already-stringified sample cells
+    n_sample = len(sample)
+    for i, r in enumerate(rows):
+        if i < n_sample:
+            cells = (per_col[c][i] for c in columns)
+        else:
+            cells = ("" if (v := r.get(c)) is None else str(v) for c in columns)
+        line = " | ".join(
+            _crop(v, col_widths[c]).ljust(col_widths[c]) for v, c in zip(cells, columns)
+        )
         print(line)
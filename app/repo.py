@@ -1,4 +1,5 @@
 from sqlmodel import SQLModel, Field, Session, create_engine
+from sqlalchemy import event
 from typing import Optional
 from datetime import datetime
 
@@ -26,6 +27,20 @@ class Setting(SQLModel, table=True):
 class Repo:
     def __init__(self, db_path: str):
         self.engine = create_engine(f"sqlite:///{db_path}", echo=False)
+
+        # Local cache DB: WAL lets the REPL read while the poller writes,
+        # and NORMAL sync drops the per-transaction fsync the default
+        # journal mode pays. (WAL assumes a local filesystem, not NFS.)
+        @event.listens_for(self.engine, "connect")
+        def _set_sqlite_pragmas(dbapi_conn, _record):
+            cur = dbapi_conn.cursor()
+            cur.execute("PRAGMA journal_mode=WAL")
+            cur.execute("PRAGMA synchronous=NORMAL")
+            cur.execute("PRAGMA temp_store=MEMORY")
+            cur.execute("PRAGMA mmap_size=268435456")
+            cur.execute("PRAGMA cache_size=-64000")
+            cur.close()
+
         SQLModel.metadata.create_all(self.engine)
 
     def session(self):
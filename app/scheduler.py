@@ -1,38 +1,48 @@
 # app/scheduler.py
-from apscheduler.schedulers.background import BackgroundScheduler
-from apscheduler.triggers.interval import IntervalTrigger
-from datetime import datetime, timedelta
-import json
 import random
+import threading
 
 from app.ui import console, print_success, print_error, print_info, yahoo_error_to_str
 
+# Private RNG for start-time jitter so we never touch (or reseed) the
+# global random state user code may rely on.
+_JITTER_RNG = random.Random()
 
-def start_scheduler(y, repo, poll_min: int):
-    # Coalesce & single instance so bursts don’t stack if Yahoo is slow
-    sch = BackgroundScheduler(job_defaults={"coalesce": True, "max_instances": 1})
 
-    # jitter first run a bit so we don't always hit at the top of the minute
-    first_run = datetime.now() + timedelta(seconds=10 + int(random.uniform(0, 8)))
+class _PollScheduler:
+    """
+    Minimal self-rescheduling timer loop: one daemon threading.Timer per
+    job instead of APScheduler's scheduler thread (and its pytz import
+    footprint). Jobs are single-instance by construction — the next timer
+    is only armed after the current tick returns, so bursts can't stack
+    when Yahoo is slow.
+    """
+
+    def __init__(self, y, poll_min: int):
+        self.y = y
+        self.poll_min = poll_min
+        self._timers = {}
+        self._stopped = False
+        # transient failure tracker
+        self.fail_state = {"count": 0, "muted": False}
 
-    # transient failure tracker in closure
-    fail_state = {"count": 0, "muted": False}
+    def _arm(self, name, delay_sec, fn):
+        if self._stopped:
+            return
+        t = threading.Timer(delay_sec, fn)
+        t.daemon = True
+        self._timers[name] = t
+        t.start()
 
-    @sch.scheduled_job(
-        "interval",
-        minutes=poll_min,
-        next_run_time=first_run,
-        id="every_min_fetch",
-    )
-    def every_min_fetch():
+    def _fetch_tick(self):
+        fail_state = self.fail_state
+        delay = self.poll_min * 60
         try:
-            st = y.standings()   # light touch endpoint
+            st = self.y.standings()   # light touch endpoint
             fail_state["count"] = 0
             if fail_state["muted"]:
                 print_info("[every_min_fetch] Yahoo recovered; resuming normal cadence.")
                 fail_state["muted"] = False
-                # restore normal cadence if we previously backed off
-                sch.reschedule_job("every_min_fetch", trigger=IntervalTrigger(minutes=poll_min))
             print_success(f"[every_min_fetch] Standings OK — {len(st)} teams")
         except Exception as e:
             fail_state["count"] += 1
@@ -44,25 +54,34 @@ def start_scheduler(y, repo, poll_min: int):
 
             # If flaking repeatedly, back off to 15 min until it recovers
             if fail_state["count"] >= 3 and not fail_state["muted"]:
-                sch.reschedule_job("every_min_fetch", trigger=IntervalTrigger(minutes=15))
                 print_info("[every_min_fetch] backing off to every 15 min due to Yahoo transient errors…")
                 fail_state["muted"] = True
+            if fail_state["muted"]:
+                delay = 15 * 60
+        self._arm("every_min_fetch", delay, self._fetch_tick)
 
-    # Optional: light draft check (kept minimal; you can delete if you prefer)
-    @sch.scheduled_job(
-        "interval",
-        minutes=15,
-        next_run_time=datetime.now() + timedelta(seconds=12 + int(random.uniform(0, 8))))
-    def draft_check():
+    def _draft_tick(self):
         try:
-            status = y.get_draft_status()
+            status = self.y.get_draft_status()
             # keep it quiet unless live
             if (status.get("draft_status") or "").lower() == "inprogress":
                 print_success("🚨 Your draft is LIVE! 🚨")
-        except Exception as e:
-            # quiet by default; uncomment if you want visibility:
-            # print_error(f"[draft_check] {yahoo_error_to_str(e)}")
+        except Exception:
+            # quiet by default
             pass
+        self._arm("draft_check", 15 * 60, self._draft_tick)
 
-    sch.start()
-    return sch
+    def start(self):
+        # jitter first runs a bit so we don't always hit at the top of the minute
+        self._arm("every_min_fetch", 10 + int(_JITTER_RNG.uniform(0, 8)), self._fetch_tick)
+        self._arm("draft_check", 12 + int(_JITTER_RNG.uniform(0, 8)), self._draft_tick)
+        return self
+
+    def shutdown(self):
+        self._stopped = True
+        for t in self._timers.values():
+            t.cancel()
+
+
+def start_scheduler(y, repo, poll_min: int):
+    return _PollScheduler(y, poll_min).start()
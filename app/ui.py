@@ -1,27 +1,49 @@
 # app/ui.py
 from typing import Any, Dict, Optional
 import json
-from rich.console import Console
-from rich.panel import Panel
-from rich.table import Table
-from rich.text import Text
 
-console = Console()
+try:
+    import orjson  # faster parse of Yahoo error payloads; stdlib fallback
+except ImportError:
+    orjson = None
+
+# rich is imported on first use (PEP 562 lazy-load): importing app.ui no
+# longer pulls rich.console/table/panel, which matters for modules that
+# only need yahoo_error_to_str or the print helpers on error paths.
+_console = None
+
+
+def _get_console():
+    global _console
+    if _console is None:
+        from rich.console import Console
+        _console = Console()
+    return _console
+
+
+def __getattr__(name):
+    # keeps `from app.ui import console` working without an eager import
+    if name == "console":
+        return _get_console()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
 
 def banner(title: str):
-    console.rule(f"[bold green]{title}[/]")
+    _get_console().rule(f"[bold green]{title}[/]")
 
 def print_info(msg: str):
-    console.print(f"[cyan]ℹ[/] {msg}")
+    _get_console().print(f"[cyan]ℹ[/] {msg}")
 
 def print_success(msg: str):
-    console.print(f"[green]✔[/] {msg}")
+    _get_console().print(f"[green]✔[/] {msg}")
 
 def print_warn(msg: str):
-    console.print(f"[yellow]⚠[/] {msg}")
+    _get_console().print(f"[yellow]⚠[/] {msg}")
 
 def print_error(msg: str):
-    console.print(Panel.fit(Text(msg, style="bold red"), title="Error", border_style="red"))
+    from rich.panel import Panel
+    from rich.text import Text
+    _get_console().print(Panel.fit(Text(msg, style="bold red"), title="Error", border_style="red"))
 
 def yahoo_error_to_str(err: Exception) -> str:
     """
@@ -32,7 +54,7 @@ def yahoo_error_to_str(err: Exception) -> str:
     if s.startswith("b'") and s.endswith("'"):
         s = s[2:-1]
     try:
-        obj = json.loads(s)
+        obj = orjson.loads(s) if orjson is not None else json.loads(s)
         if isinstance(obj, dict) and "error" in obj and isinstance(obj["error"], dict):
             e = obj["error"]
             desc = e.get("description") or e.get("message") or "Yahoo API error"
@@ -46,7 +68,8 @@ def yahoo_error_to_str(err: Exception) -> str:
         return s
 
 
-def kv_table(title: str, rows: Dict[str, Any]) -> Table:
+def kv_table(title: str, rows: Dict[str, Any]):
+    from rich.table import Table
     t = Table(title=title, show_lines=False, header_style="bold magenta")
     t.add_column("Key", style="cyan", no_wrap=True)
     t.add_column("Value", style="white")
@@ -55,9 +78,14 @@ def kv_table(title: str, rows: Dict[str, Any]) -> Table:
     return t
 
 def simple_table(title: str, columns, data):
+    from rich.table import Table
     t = Table(title=title, show_lines=False, header_style="bold magenta")
+    columns = tuple(columns)
     for c in columns:
         t.add_column(c)
-    for row in data:
-        t.add_row(*[str(row.get(c, "")) for c in columns])
+    # Stringify every cell up front; the add_row loop then just hands
+    # ready tuples to Rich instead of interleaving str() per cell.
+    rows_out = [tuple(str(row.get(c, "")) for c in columns) for row in data]
+    for r in rows_out:
+        t.add_row(*r)
     return t
@@ -3,9 +3,12 @@ from rich.table import Table
 def table_suggestions(title: str, items):
     t = Table(title=title, show_lines=False)
     if not items: return t
-    # infer columns from keys in first dict
-    for k in items[0].keys():
+    # infer columns from keys in first dict (hoisted — the old loop
+    # re-materialized the key view per row)
+    keys = list(items[0].keys())
+    for k in keys:
         t.add_column(k)
-    for it in items:
-        t.add_row(*[str(it[k]) for k in items[0].keys()])
+    rows_out = [tuple(str(it[k]) for k in keys) for it in items]
+    for r in rows_out:
+        t.add_row(*r)
     return t
@@ -1,10 +1,28 @@
 # app/yahoo_client.py
+import ast
+import bisect
+import re
 import time
 import json
 import random
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from operator import itemgetter
 from typing import Callable, Any, Iterable, List, Dict, Optional, Tuple
-from yahoo_oauth import OAuth2
-from yahoo_fantasy_api import league as yf_league
+# yahoo_oauth and yahoo_fantasy_api are imported inside __init__/league()
+# — they pull requests + rauth at import time, which the error-helper
+# consumers of this module don't need.
+
+try:
+    import orjson  # Rust parser, ~2-5x stdlib on Yahoo-size payloads
+except ImportError:
+    orjson = None
+
+
+def _json_loads(s):
+    if orjson is not None:
+        return orjson.loads(s)
+    return json.loads(s)
 
 
 # ---- Small, readable error type (optional) -----------------------------------
@@ -17,12 +35,18 @@ class YahooClientError(RuntimeError):
 
 def _decode_err_text(e: Exception) -> str:
     """Best-effort to turn Yahoo errors (incl. bytes) into plain text."""
+    # When the library raised with raw bytes, decode them directly and
+    # skip the str(e) repr round-trip entirely.
+    args = getattr(e, "args", None)
+    if args and isinstance(args[0], (bytes, bytearray)):
+        return args[0].decode("utf-8", "replace")
     msg = str(e)
-    if msg.startswith("b'") and msg.endswith("'"):
+    if msg.startswith(("b'", 'b"')) and msg.endswith(("'", '"')):
         try:
-            msg = bytes(msg[2:-1], "utf-8").decode("unicode_escape")
+            # literal_eval recovers the bytes from the repr in one step
+            return ast.literal_eval(msg).decode("utf-8", "replace")
         except Exception:
-            msg = msg[2:-1]
+            return msg[2:-1]
     return msg
 
 
@@ -33,7 +57,7 @@ def _parse_yahoo_error(e: Exception) -> Tuple[str, Optional[str], Optional[str]]
     """
     msg = _decode_err_text(e).strip()
     try:
-        parsed = json.loads(msg)
+        parsed = _json_loads(msg)
         err = parsed.get("error", {})
         desc = err.get("description") or "Yahoo API error"
         uri = err.get("yahoo:uri") or err.get("uri")
@@ -43,21 +67,48 @@ def _parse_yahoo_error(e: Exception) -> Tuple[str, Optional[str], Optional[str]]
         return msg, None, None
 
 
+def _retry_after_hint(e: Exception) -> Optional[float]:
+    """
+    Pull a Retry-After value (in seconds) from a requests.Response attached
+    to the exception, if one is there. Yahoo signals rate limiting with 999
+    and sometimes an explicit header; honoring it beats guessing.
+    """
+    resp = getattr(e, "response", None)
+    if resp is None:
+        for a in getattr(e, "args", ()) or ():
+            if hasattr(a, "headers"):
+                resp = a
+                break
+    headers = getattr(resp, "headers", None)
+    if not headers:
+        return None
+    raw = headers.get("Retry-After")
+    if raw is None:
+        return None
+    try:
+        return max(0.0, float(raw))
+    except (TypeError, ValueError):
+        # HTTP-date form; not worth parsing for a backoff hint
+        return None
+
+
+# Compiled once; a single case-insensitive scan replaces seven Python
+# substring checks plus the .lower() copy on every retry decision.
+_TEMP_RE = re.compile(
+    r"temporary problem|please try again shortly|throttle|rate limit"
+    r"|999|unavailable|timeout",
+    re.IGNORECASE,
+)
+
+
 def _looks_temporary(err_text: str) -> bool:
-    t = err_text.lower()
-    return (
-        "temporary problem" in t
-        or "please try again shortly" in t
-        or "throttle" in t
-        or "rate limit" in t
-        or "999" in t
-        or "unavailable" in t
-        or "timeout" in t
-    )
+    return _TEMP_RE.search(err_text) is not None
 
 
 class YahooClient:
     def __init__(self, league_id: str, oauth_file: str = "data/yahoo_oauth.json"):
+        from yahoo_oauth import OAuth2
+
         self.oauth = OAuth2(None, None, from_file=oauth_file)
         try:
             # Some setups don’t expose .session; guard it.
@@ -71,6 +122,37 @@ class YahooClient:
         except Exception:
             pass
 
+        # Widen the connection pool so concurrent position fetches reuse
+        # kept-alive connections instead of paying a TLS handshake each;
+        # requests' default pool of 10 also logs pool-full warnings under
+        # the threaded available_players fetch.
+        try:
+            from requests.adapters import HTTPAdapter
+            sess = getattr(self.oauth, "session", None)
+            if sess and hasattr(sess, "mount"):
+                adapter = HTTPAdapter(pool_connections=8, pool_maxsize=16)
+                sess.mount("https://", adapter)
+                sess.mount("http://", adapter)
+        except Exception:
+            pass
+
+        # requests defaults to no timeout, so one hung socket can stall a
+        # "retry" for minutes. Inject a (connect, read) timeout on every
+        # request that doesn't set its own; each attempt then fails fast
+        # enough for _retry's backoff to do its job.
+        try:
+            sess = getattr(self.oauth, "session", None)
+            if sess and hasattr(sess, "request"):
+                orig_request = sess.request
+
+                def _request_with_timeout(method, url, **kw):
+                    kw.setdefault("timeout", (5, 15))
+                    return orig_request(method, url, **kw)
+
+                sess.request = _request_with_timeout
+        except Exception:
+            pass
+
         # First run: no tokens yet → interactive login
         if not getattr(self.oauth, "access_token", None):
             self.oauth.get_access_token()
@@ -81,19 +163,45 @@ class YahooClient:
 
         self.league_id = league_id
         self._league = None
+        # available_players() fans out over a thread pool, so the lazy
+        # League construction below needs a lock or each worker could
+        # build (and race on) its own wrapper.
+        self._league_lock = threading.Lock()
+        self._settings_cache = {"ts": 0, "data": None}
+        # TTL cache for FA/waiver pool fetches, same idea as the settings
+        # cache: the pool changes on minute-to-hour scale, so back-to-back
+        # sorts/searches shouldn't re-hit Yahoo.
+        self._pool_cache: Dict[Tuple[str, Optional[str]], Tuple[float, Any]] = {}
 
     def league(self):
+        # Double-checked: the unlocked read keeps the common path free of
+        # lock traffic; attribute assignment is atomic in CPython, so
+        # readers never see a half-built wrapper.
         if self._league is None:
-            self._league = yf_league.League(self.oauth, self.league_id)
+            with self._league_lock:
+                if self._league is None:
+                    from yahoo_fantasy_api import league as yf_league
+                    self._league = yf_league.League(self.oauth, self.league_id)
         return self._league
 
     # --- Retry helper (longer & smarter for Yahoo temp faults) -----------------
-    def _retry(self, fn: Callable[[], Any], *, tries=6, base_sleep=0.6, max_sleep=8.0) -> Any:
+    # Backoff contract: initial sleep, multiplier, jitter band, cap. Kept as
+    # class attrs so callers/tests can tune pacing without touching _retry.
+    retry_base_sleep = 0.6
+    retry_multiplier = 2.0
+    retry_jitter = (0.7, 1.3)
+    retry_max_sleep = 8.0
+    retry_after_cap = 30.0  # ceiling on server-supplied Retry-After hints
+
+    def _retry(self, fn: Callable[[], Any], *, tries=6, base_sleep=None, max_sleep=None) -> Any:
         """
         Retries on intermittent Yahoo faults (999/500/"temporary problem...").
-        - Exponential backoff + jitter
+        - Honors a server Retry-After header when one is attached
+        - Exponential backoff + jitter otherwise
         - Fast-fails on clear auth problems
         """
+        base_sleep = self.retry_base_sleep if base_sleep is None else base_sleep
+        max_sleep = self.retry_max_sleep if max_sleep is None else max_sleep
         last_err = None
         for i in range(tries):
             try:
@@ -106,11 +214,15 @@ class YahooClient:
                 if any(s in msg for s in ("401", "invalid_grant", "Not authorized")):
                     raise
 
-                # Decide sleep
-                sleep = min(base_sleep * (2 ** i), max_sleep)
-                # Add jitter (±30%)
-                jitter = random.uniform(0.7, 1.3)
-                sleep *= jitter
+                # Decide sleep: the server's own pacing hint wins over the
+                # exponential guess (no jitter — the hint is exact)
+                hint = _retry_after_hint(e)
+                if hint is not None:
+                    sleep = min(hint, self.retry_after_cap)
+                else:
+                    sleep = min(base_sleep * (self.retry_multiplier ** i), max_sleep)
+                    # Add jitter (±30%)
+                    sleep *= random.uniform(*self.retry_jitter)
 
                 # If it doesn't look temporary and we're near the end, stop early
                 if i >= 2 and not _looks_temporary(msg) and i >= tries - 2:
@@ -153,12 +265,27 @@ class YahooClient:
     def matchups(self, week: int):
         return self._retry(lambda: self.league().matchups(week))
 
-    def waiver_wire(self):
+    def _cached(self, key: Tuple[str, Optional[str]], ttl_sec: int, fn: Callable[[], Any]) -> Any:
+        now = time.time()
+        hit = self._pool_cache.get(key)
+        if hit is not None and now - hit[0] < ttl_sec:
+            return hit[1]
+        data = fn()
+        self._pool_cache[key] = (now, data)
+        return data
+
+    def waiver_wire(self, ttl_sec: int = 90):
         # Note: yahoo_fantasy_api uses `waivers()` on League
-        return self._retry(lambda: self.league().waivers())
+        return self._cached(
+            ("waivers", None), ttl_sec,
+            lambda: self._retry(lambda: self.league().waivers()),
+        )
 
-    def free_agents(self, pos: str):
-        return self._retry(lambda: self.league().free_agents(pos))
+    def free_agents(self, pos: str, ttl_sec: int = 90):
+        return self._cached(
+            ("free_agents", pos), ttl_sec,
+            lambda: self._retry(lambda: self.league().free_agents(pos)),
+        )
 
     def players(self, **kw):
         return self._retry(lambda: self.league().players(**kw))
@@ -167,7 +294,10 @@ class YahooClient:
         return self._retry(lambda: self.league().draft_results())
 
     def transactions(self):
-        return self._retry(lambda: self.league().transactions())
+        data = self._retry(lambda: self.league().transactions())
+        # Fresh transactions mean the FA/waiver pool may have changed
+        self._pool_cache.clear()
+        return data
 
     # ---------- Unified available pool (FA + Waivers) --------------------------
     def available_players(
@@ -198,117 +328,132 @@ class YahooClient:
         """
         positions = [position] if position else ["QB", "RB", "WR", "TE", "DEF", "K"]
 
-        # Collect Free Agents by position
-        pool: List[dict] = []
-        for idx, pos in enumerate(positions):
-            try:
-                fa = self.free_agents(pos) or []
-            except YahooClientError as e:
-                # If we see a temp fault on one position, short cool-down and continue others
-                if _looks_temporary(str(e)):
-                    time.sleep(0.5 + random.random() * 0.5)
-                    fa = []
-                else:
-                    # Re-raise non-temporary errors
+        # Position fetches (and waivers) are independent HTTPS round-trips,
+        # so run them concurrently: wall time becomes max-of-RTTs instead
+        # of sum-of-RTTs. A small semaphore keeps at most 3 requests in
+        # flight as gentle pacing against Yahoo throttling (999s).
+        gate = threading.Semaphore(3)
+
+        def _fetch(fn, *args):
+            with gate:
+                try:
+                    return fn(*args) or []
+                except YahooClientError as e:
+                    # Swallow temp faults on one endpoint; others still count
+                    if _looks_temporary(str(e)):
+                        return []
                     raise
-            for item in _coerce_player_dicts(fa):
-                item["_availability"] = "FA"
-                pool.append(item)
 
-            # Gentle pacing between calls to avoid bursty throttling
-            if idx < len(positions) - 1:
-                time.sleep(0.15 + random.random() * 0.1)
+        # Streaming merge: normalize each batch as its fetch completes
+        # instead of materializing the full pool and then a full rows
+        # list. With a limit, rows funnel into a bounded sorted buffer
+        # (bisect.insort capped at `limit` entries), so peak memory is
+        # O(limit) rather than O(pool).
+        # Lower the needle once, not once per player
+        needle = search.lower() if search else None
+        key = (sort or "AR").upper()
+        sk = {"POWN": "_sk_pown", "NAME": "_sk_name"}.get(key, "_sk_ar")
+        sort_key = itemgetter(sk)  # C-level key fn, no per-compare bytecode
 
-        # Merge Waivers if requested
-        if include_waivers:
-            try:
-                wv = self.waiver_wire() or []
-            except YahooClientError as e:
-                if _looks_temporary(str(e)):
-                    wv = []
-                else:
-                    raise
-            for item in _coerce_player_dicts(wv):
-                item["_availability"] = "W"
-                # avoid dupes by player_id
-                pid = _from_kv(item, "player_id")
-                if pid and not any(_from_kv(x, "player_id") == pid for x in pool):
-                    # respect position filter if provided
-                    if (not position) or (position in (_eligible_positions(item) or [])):
-                        pool.append(item)
-
-        # Normalize to consistent row schema
-        rows: List[Dict[str, Any]] = []
-        for p in pool:
-            pid = _safe_get(p, ["player_id", "0", "player_id"]) or _from_kv(p, "player_id")
+        def _normalize(p: dict, avail: str):
+            """Build one row from a raw player blob; returns (pid, row|None)."""
+            flat = _flatten_kv(p)
+            pid = _safe_get(p, ["player_id", "0", "player_id"]) or _field(p, flat, "player_id")
             name = _player_name(p)
-            team = _from_kv(p, "editorial_team_abbr")
+            # Search filter runs before the remaining field reads — no
+            # point flattening bye/%owned for a player we'll drop.
+            if needle is not None:
+                if not name or needle not in name.lower():
+                    return pid, None
             elig = _eligible_positions(p)
-            primary = elig[0] if elig else None
-            bye = _bye_week(p)
-            pown = _percent_owned(p)
-            stat = _from_kv(p, "status")
-            inj = _from_kv(p, "injury_note")
-
             row = {
                 "player_id": pid,
                 "name": name,
-                "team": team,
-                "pos": primary,
+                "team": _field(p, flat, "editorial_team_abbr"),
+                "pos": elig[0] if elig else None,
                 "elig": elig,
-                "bye": bye,
-                "%owned": pown,
-                "stat": stat,
-                "inj": inj,
-                "avail": p.get("_availability", "FA"),
+                "bye": _bye_week(p, flat),
+                "%owned": _percent_owned(p, flat),
+                "stat": _field(p, flat, "status"),
+                "inj": _field(p, flat, "injury_note"),
+                "avail": avail,
             }
 
-            # Apply search filter if requested
-            if search:
-                if not (name or ""):
-                    continue
-                if search.lower() not in name.lower():
-                    continue
-
-            rows.append(row)
-
-        # Local sort
-        def sort_key_AR(r):
-            # Approx "added recently" fallback: less owned first, stable by name
-            try:
-                own = float(r.get("%owned") or 0.0)
-            except Exception:
-                own = 0.0
-            return (own, r.get("name") or "")
-
-        def sort_key_POWN(r):
+            # Decorate with precomputed sort keys so the comparator never
+            # re-parses %owned or re-splits the name.
             try:
-                own = float(r.get("%owned") or 0.0)
+                own = float(row["%owned"] or 0.0)
             except Exception:
                 own = 0.0
-            return (-own, r.get("name") or "")
-
-        def sort_key_NAME(r):
-            nm = r.get("name") or ""
+            nm = name or ""
             parts = nm.split()
             first = parts[0] if parts else ""
             last = parts[-1] if len(parts) > 1 else first
-            return (last, first)
+            # AR = approx "added recently": less owned first, stable by name
+            row["_sk_ar"] = (own, nm)
+            row["_sk_pown"] = (-own, nm)
+            row["_sk_name"] = (last, first)
+            return pid, row
+
+        bounded = isinstance(limit, int) and limit >= 0
+        buf: List[Any] = []  # rows, or (key, seq, row) triples when bounded
+        seq = 0              # tie-break so equal keys never compare row dicts
+
+        def _collect(row):
+            nonlocal seq
+            if not bounded:
+                buf.append(row)
+                return
+            if limit == 0:
+                return
+            entry = (row[sk], seq, row)
+            seq += 1
+            if len(buf) < limit:
+                bisect.insort(buf, entry)
+            elif entry[0] < buf[-1][0]:
+                bisect.insort(buf, entry)
+                buf.pop()
+
+        seen_pids = set()
+        wv: List[dict] = []
+        with ThreadPoolExecutor(max_workers=min(4, len(positions) + 1)) as ex:
+            fa_futures = [ex.submit(_fetch, self.free_agents, pos) for pos in positions]
+            wv_future = ex.submit(_fetch, self.waiver_wire) if include_waivers else None
+            for fut in as_completed(fa_futures):
+                for item in _coerce_player_dicts(fut.result()):
+                    pid, row = _normalize(item, "FA")
+                    if pid:
+                        seen_pids.add(pid)  # dedupe index for the waiver merge
+                    if row is not None:
+                        _collect(row)
+            if wv_future is not None:
+                wv = wv_future.result()
+
+        # Merge Waivers if requested (every FA pid is already indexed,
+        # so membership checks stay O(1))
+        if include_waivers:
+            for item in _coerce_player_dicts(wv):
+                # avoid dupes by player_id
+                pid = _from_kv(item, "player_id")
+                if not pid or pid in seen_pids:
+                    continue
+                # respect position filter if provided
+                if position and position not in (_eligible_positions(item) or []):
+                    continue
+                seen_pids.add(pid)
+                _, row = _normalize(item, "W")
+                if row is not None:
+                    _collect(row)
 
-        key = (sort or "AR").upper()
-        if key == "POWN":
-            rows.sort(key=sort_key_POWN)
-        elif key == "NAME":
-            rows.sort(key=sort_key_NAME)
+        if bounded:
+            rows = [entry[2] for entry in buf]  # buffer is already in key order
         else:
-            rows.sort(key=sort_key_AR)
+            rows = buf
+            rows.sort(key=sort_key)
 
-        # Enforce limit
-        if isinstance(limit, int) and limit >= 0:
-            rows = rows[:limit]
-
-        # Yield
+        # Yield (undecorate first)
         for r in rows:
+            del r["_sk_ar"], r["_sk_pown"], r["_sk_name"]
             yield r
 
 
@@ -331,6 +476,37 @@ def _coerce_player_dicts(items: Any) -> Iterable[dict]:
     return out
 
 
+def _flatten_kv(p) -> dict:
+    """
+    Flatten the KV blob under p[0] into a plain {name: value} dict in one
+    pass, so repeated field reads are O(1) instead of re-walking the
+    nested lists per key (the shapes _from_kv probes one key at a time).
+    """
+    flat = {}
+    if not isinstance(p, dict):
+        return flat
+    kv = p.get(0)
+    if isinstance(kv, dict):
+        # Flat {'name':..., 'value':...} shape
+        if isinstance(kv.get("name"), str) and "value" in kv:
+            flat[kv["name"]] = kv.get("value")
+        # Arrays of {'name': '...', 'value': '...'}
+        for maybe_list in kv.values():
+            if isinstance(maybe_list, list):
+                for item in maybe_list:
+                    if isinstance(item, dict) and "name" in item:
+                        flat[item["name"]] = item.get("value")
+    return flat
+
+
+def _field(p, flat, key):
+    """Read `key` from the player dict directly, falling back to its
+    pre-flattened KV blob (mirrors _from_kv's lookup order)."""
+    if key in p:
+        return p[key]
+    return flat.get(key)
+
+
 def _from_kv(obj, key):
     """Yahoo often uses KV blobs. Try several common shapes to extract `key`."""
     if not isinstance(obj, dict):
@@ -365,56 +541,74 @@ def _safe_get(obj, keys):
 
 
 def _player_name(p):
+    # Memoized on the dict: the waiver-merge filter and row build both
+    # ask for the name. These dicts persist in the TTL pool cache across
+    # calls, so only stash values that are pure functions of the dict —
+    # nothing call-dependent or non-deterministic.
+    if "__name" in p:
+        return p["__name"]
     name = p.get(0, {}).get("name") or p.get("name")
     if isinstance(name, dict):
         first = name.get("first", "")
         last = name.get("last", "")
-        return (" ".join([first, last])).strip()
+        name = (" ".join([first, last])).strip()
+    p["__name"] = name
     return name
 
 
+def _numeric_ordered(d) -> list:
+    """
+    Values of a Yahoo numeric-keyed dict ({'0': ..., '1': ...}) in key
+    order. One pass over the keys instead of the old probe-until-miss
+    loop that rebuilt str(i) every step (hot for 30+ stat entries).
+    """
+    if not isinstance(d, dict):
+        return []
+    keys = [k for k in d if isinstance(k, str) and k.isdigit()]
+    keys.sort(key=int)
+    return [d[k] for k in keys]
+
+
 def _eligible_positions(p):
     """
     Normalize eligible positions across common Yahoo shapes.
     Common:
       {'eligible_positions': {'0': {'position': 'RB'}, '1': {'position': 'WR'}}}
       {'eligible_positions': ['RB', 'WR']}
+    Memoized on the dict itself — see _player_name.
     """
-    ep = p.get("eligible_positions")
-    if not ep:
-        return []
+    cached = p.get("__elig")
+    if cached is not None:
+        return cached
 
+    ep = p.get("eligible_positions")
+    positions = []
     # Case A: dict with numeric keys -> each has {'position': 'X'}
     if isinstance(ep, dict):
-        positions = []
-        i = 0
-        while True:
-            item = ep.get(str(i))
-            if item is None:
-                break
-            pos = item.get("position")
+        for item in _numeric_ordered(ep):
+            pos = item.get("position") if isinstance(item, dict) else None
             if pos:
                 positions.append(pos)
-            i += 1
-        return positions
-
     # Case B: already a list of strings
-    if isinstance(ep, list):
-        return [x for x in ep if isinstance(x, str)]
+    elif isinstance(ep, list):
+        positions = [x for x in ep if isinstance(x, str)]
 
-    return []
+    p["__elig"] = positions
+    return positions
 
 
-def _bye_week(p):
-    bw = _from_kv(p, "bye_weeks")
+def _bye_week(p, flat=None):
+    bw = _field(p, flat, "bye_weeks") if flat is not None else _from_kv(p, "bye_weeks")
     if isinstance(bw, dict):
         # {"week":"14"} or similar
         return bw.get("week")
     return bw
 
 
-def _percent_owned(p):
-    po = p.get("percent_owned") or _from_kv(p, "percent_owned")
+def _percent_owned(p, flat=None):
+    po = p.get("percent_owned")
+    if not po:
+        po = flat.get("percent_owned") if flat is not None else _from_kv(p, "percent_owned")
     if isinstance(po, dict):
         return po.get("value") or po.get("percent_owned")
     return po
@@ -427,18 +621,12 @@ def _stats_map(p):
         return out
     # Try typical shape: stats["stats"]["0"]["stat"]["stat_id"], ["value"]
     try:
-        stats_root = stats.get("stats", {})
-        i = 0
-        while True:
-            entry = stats_root.get(str(i))
-            if entry is None:
-                break
+        for entry in _numeric_ordered(stats.get("stats", {})):
             stat = entry.get("stat", {})
             sid = stat.get("stat_id")
             val = int(stat.get("value")) if isinstance(stat.get("value"), str) and stat.get("value").isdigit() else stat.get("value")
             if sid is not None:
                 out[str(sid)] = val
-            i += 1
     except Exception:
         pass
     return out